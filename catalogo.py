@@ -6,8 +6,6 @@ Responsável pelo cadastro de livros, autores, estoque e status.
 from dataclasses import dataclass, field
 from typing import List, Optional
 from enum import Enum
-import sys
-sys.path.insert(0, '/home/ubuntu/sgbu_python')
 
 from utils.excecoes import (
     LivroNaoEncontradoException,
@@ -23,7 +21,15 @@ class StatusLivro(Enum):
     RESERVADO = "Reservado"
 
 
-@dataclass
+# Mapeia nomes e valores (originais e em minúsculas) para os membros de StatusLivro
+_STATUS_LIVRO_MAP = {
+    chave: s
+    for s in StatusLivro
+    for chave in (s.name, s.value, s.name.lower(), s.value.lower())
+}
+
+
+@dataclass(slots=True, eq=False)
 class Livro:
     """Classe que representa um livro no catálogo."""
     isbn: str
@@ -33,25 +39,62 @@ class Livro:
     status: StatusLivro = StatusLivro.DISPONIVEL
     editora: Optional[str] = None
     ano_publicacao: Optional[int] = None
+    # Autor normalizado, usado como chave do índice de autores
+    _autor_key: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Valida os dados do livro após a inicialização."""
         self._validar()
+        self._autor_key = self.autor.casefold()
+
+    def __eq__(self, other):
+        """Dois livros são iguais quando têm o mesmo ISBN."""
+        if not isinstance(other, Livro):
+            return NotImplemented
+        return self.isbn == other.isbn
+
+    def __hash__(self):
+        """Hash baseado no ISBN (chave natural do livro)."""
+        return hash(self.isbn)
 
     def _validar(self):
         """Valida os dados do livro."""
-        if not self.isbn or not isinstance(self.isbn, str):
+        if type(self.isbn) is not str or not self.isbn:
             raise ValidacaoException("ISBN é obrigatório e deve ser uma string.")
         
-        if not self.titulo or not isinstance(self.titulo, str):
+        if type(self.titulo) is not str or not self.titulo:
             raise ValidacaoException("Título é obrigatório e deve ser uma string.")
         
-        if not self.autor or not isinstance(self.autor, str):
+        if type(self.autor) is not str or not self.autor:
             raise ValidacaoException("Autor é obrigatório e deve ser uma string.")
         
-        if not isinstance(self.estoque, int) or self.estoque < 0:
+        if type(self.estoque) is not int or self.estoque < 0:
             raise ValidacaoException("Estoque deve ser um número inteiro não-negativo.")
 
+    @classmethod
+    def _from_trusted(cls, dados: dict) -> "Livro":
+        """
+        Reconstrói um livro a partir de um dicionário gerado por to_dict, sem validação.
+        
+        Deve ser usado apenas com dados já validados (ex.: recarga de dados serializados).
+        
+        Args:
+            dados: Dicionário no formato de to_dict.
+        
+        Returns:
+            Livro: O livro reconstruído.
+        """
+        livro = cls.__new__(cls)
+        livro.isbn = dados["isbn"]
+        livro.titulo = dados["titulo"]
+        livro.autor = dados["autor"]
+        livro._autor_key = livro.autor.casefold()
+        livro.estoque = dados["estoque"]
+        livro.status = _STATUS_LIVRO_MAP[dados["status"]]
+        livro.editora = dados.get("editora")
+        livro.ano_publicacao = dados.get("ano_publicacao")
+        return livro
+
     def to_dict(self):
         """Serializa o livro para um dicionário (contrato de serialização)."""
         return {
@@ -74,6 +117,12 @@ class ModuloCatalogo:
     def __init__(self):
         """Inicializa o módulo com um dicionário vazio de livros."""
         self._livros: dict[str, Livro] = {}
+        # Índice secundário: autor normalizado -> {ISBN: ordem de cadastro}, na ordem do catálogo
+        self._por_autor: dict[str, dict[str, int]] = {}
+        self._contador_cadastros = 0
+        # Agregados mantidos a cada alteração de estoque (usados nos relatórios)
+        self._total_copias = 0
+        self._livros_sem_estoque = 0
 
     def cadastrar_livro(self, isbn: str, titulo: str, autor: str, estoque: int, 
                        editora: Optional[str] = None, ano_publicacao: Optional[int] = None) -> Livro:
@@ -107,6 +156,11 @@ class ModuloCatalogo:
         )
         
         self._livros[isbn] = livro
+        self._contador_cadastros += 1
+        self._indexar_autor(livro, self._contador_cadastros)
+        self._total_copias += livro.estoque
+        if livro.estoque == 0:
+            self._livros_sem_estoque += 1
         return livro
 
     def obter_livro(self, isbn: str) -> Livro:
@@ -127,6 +181,18 @@ class ModuloCatalogo:
         
         return self._livros[isbn]
 
+    def obter_livro_opt(self, isbn: str) -> Optional[Livro]:
+        """
+        Obtém um livro pelo ISBN, sem lançar exceção caso não exista.
+        
+        Args:
+            isbn: ISBN do livro.
+        
+        Returns:
+            Optional[Livro]: O livro encontrado ou None.
+        """
+        return self._livros.get(isbn)
+
     def listar_livros(self) -> List[Livro]:
         """
         Lista todos os livros cadastrados.
@@ -136,6 +202,33 @@ class ModuloCatalogo:
         """
         return list(self._livros.values())
 
+    def total_livros(self) -> int:
+        """
+        Retorna a quantidade de títulos cadastrados.
+        
+        Returns:
+            int: Quantidade de títulos.
+        """
+        return len(self._livros)
+
+    def total_copias(self) -> int:
+        """
+        Retorna a soma do estoque de todos os livros.
+        
+        Returns:
+            int: Quantidade de cópias disponíveis.
+        """
+        return self._total_copias
+
+    def total_livros_sem_estoque(self) -> int:
+        """
+        Retorna a quantidade de livros com estoque zero.
+        
+        Returns:
+            int: Quantidade de livros indisponíveis.
+        """
+        return self._livros_sem_estoque
+
     def editar_livro(self, isbn: str, titulo: Optional[str] = None, autor: Optional[str] = None,
                     editora: Optional[str] = None, ano_publicacao: Optional[int] = None) -> Livro:
         """
@@ -153,14 +246,26 @@ class ModuloCatalogo:
         
         Raises:
             LivroNaoEncontradoException: Se o livro não existe.
+            ValidacaoException: Se o autor é vazio ou não é uma string.
         """
         livro = self.obter_livro(isbn)
         
+        # Valida e normaliza o autor antes de qualquer alteração no livro ou no índice
+        if autor is not None:
+            if type(autor) is not str or not autor:
+                raise ValidacaoException("Autor é obrigatório e deve ser uma string.")
+            chave = autor.casefold()
+        
         if titulo is not None:
             livro.titulo = titulo
         
         if autor is not None:
             livro.autor = autor
+            # Só muda de bucket se o autor normalizado mudou
+            if chave != livro._autor_key:
+                ordem = self._desindexar_autor(livro)
+                livro._autor_key = chave
+                self._indexar_autor(livro, ordem)
         
         if editora is not None:
             livro.editora = editora
@@ -184,6 +289,10 @@ class ModuloCatalogo:
             LivroNaoEncontradoException: Se o livro não existe.
         """
         livro = self.obter_livro(isbn)
+        self._desindexar_autor(livro)
+        self._total_copias -= livro.estoque
+        if livro.estoque == 0:
+            self._livros_sem_estoque -= 1
         del self._livros[isbn]
         return True
 
@@ -223,6 +332,9 @@ class ModuloCatalogo:
             raise EstoqueInsuficienteException(f"Livro '{isbn}' está com estoque insuficiente.")
         
         livro.estoque -= 1
+        self._total_copias -= 1
+        if livro.estoque == 0:
+            self._livros_sem_estoque += 1
         return livro.estoque
 
     def incrementar_estoque(self, isbn: str) -> int:
@@ -239,7 +351,10 @@ class ModuloCatalogo:
             LivroNaoEncontradoException: Se o livro não existe.
         """
         livro = self.obter_livro(isbn)
+        if livro.estoque == 0:
+            self._livros_sem_estoque -= 1
         livro.estoque += 1
+        self._total_copias += 1
         return livro.estoque
 
     def atualizar_status(self, isbn: str, novo_status: str) -> Livro:
@@ -259,9 +374,14 @@ class ModuloCatalogo:
         """
         livro = self.obter_livro(isbn)
         
-        try:
-            status_enum = StatusLivro[novo_status.upper()] if isinstance(novo_status, str) else novo_status
-        except (KeyError, AttributeError):
+        if isinstance(novo_status, StatusLivro):
+            status_enum = novo_status
+        elif isinstance(novo_status, str):
+            status_enum = _STATUS_LIVRO_MAP.get(novo_status) or _STATUS_LIVRO_MAP.get(novo_status.lower())
+        else:
+            status_enum = None
+        
+        if status_enum is None:
             raise ValidacaoException(f"Status inválido: {novo_status}. Deve ser um dos: {[s.name for s in StatusLivro]}")
         
         livro.status = status_enum
@@ -277,4 +397,23 @@ class ModuloCatalogo:
         Returns:
             List[Livro]: Lista de livros do autor.
         """
-        return [livro for livro in self._livros.values() if livro.autor.lower() == autor.lower()]
\ No newline at end of file
+        isbns = self._por_autor.get(autor.casefold(), ())
+        return [self._livros[isbn] for isbn in isbns]
+
+    def _indexar_autor(self, livro: Livro, ordem: int):
+        """Adiciona o livro ao índice de autores, mantendo a ordem de cadastro."""
+        isbns = self._por_autor.setdefault(livro._autor_key, {})
+        ultima_ordem = next(reversed(isbns.values()), 0)
+        isbns[livro.isbn] = ordem
+        
+        # Um livro vindo de outro autor pode ser mais antigo que os já presentes
+        if ordem < ultima_ordem:
+            self._por_autor[livro._autor_key] = dict(sorted(isbns.items(), key=lambda item: item[1]))
+
+    def _desindexar_autor(self, livro: Livro) -> int:
+        """Remove o livro do índice de autores e retorna sua ordem de cadastro."""
+        isbns = self._por_autor[livro._autor_key]
+        ordem = isbns.pop(livro.isbn)
+        if not isbns:
+            del self._por_autor[livro._autor_key]
+        return ordem
@@ -4,12 +4,11 @@ Responsável pelo registro de empréstimos, devoluções e verificação de disp
 Integra-se com os módulos de Usuários e Catálogo.
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
-import sys
-sys.path.insert(0, '/home/ubuntu/sgbu_python')
 
 from utils.excecoes import (
     UsuarioNaoEncontradoException,
@@ -31,7 +30,12 @@ class StatusEmprestimo(Enum):
     ATRASADO = "Atrasado"
 
 
-@dataclass
+# Membros usados nos caminhos mais frequentes
+_ATIVO = StatusEmprestimo.ATIVO
+_DEVOLVIDO = StatusEmprestimo.DEVOLVIDO
+
+
+@dataclass(slots=True, eq=False)
 class Emprestimo:
     """Classe que representa um empréstimo."""
     id_emprestimo: str
@@ -41,6 +45,42 @@ class Emprestimo:
     data_devolucao_prevista: datetime
     data_devolucao_real: Optional[datetime] = None
     status: StatusEmprestimo = StatusEmprestimo.ATIVO
+    # Datas já formatadas em ISO, usadas por to_dict e pelos relatórios
+    _data_emprestimo_iso: str = field(init=False, repr=False, compare=False)
+    _data_devolucao_prevista_iso: str = field(init=False, repr=False, compare=False)
+    _data_devolucao_real_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Formata as datas do empréstimo uma única vez."""
+        self._data_emprestimo_iso = self.data_emprestimo.isoformat()
+        self._data_devolucao_prevista_iso = self.data_devolucao_prevista.isoformat()
+        if self.data_devolucao_real is not None:
+            self._data_devolucao_real_iso = self.data_devolucao_real.isoformat()
+
+    @property
+    def data_emprestimo_iso(self) -> str:
+        """Data do empréstimo no formato ISO."""
+        return self._data_emprestimo_iso
+
+    @property
+    def data_devolucao_prevista_iso(self) -> str:
+        """Data prevista de devolução no formato ISO."""
+        return self._data_devolucao_prevista_iso
+
+    @property
+    def data_devolucao_real_iso(self) -> Optional[str]:
+        """Data real de devolução no formato ISO (None se não devolvido)."""
+        return self._data_devolucao_real_iso
+
+    def __eq__(self, other):
+        """Dois empréstimos são iguais quando têm o mesmo ID."""
+        if not isinstance(other, Emprestimo):
+            return NotImplemented
+        return self.id_emprestimo == other.id_emprestimo
+
+    def __hash__(self):
+        """Hash baseado no ID do empréstimo (chave natural)."""
+        return hash(self.id_emprestimo)
 
     def to_dict(self):
         """Serializa o empréstimo para um dicionário (contrato de serialização)."""
@@ -48,9 +88,9 @@ class Emprestimo:
             "id_emprestimo": self.id_emprestimo,
             "matricula_usuario": self.matricula_usuario,
             "isbn_livro": self.isbn_livro,
-            "data_emprestimo": self.data_emprestimo.isoformat(),
-            "data_devolucao_prevista": self.data_devolucao_prevista.isoformat(),
-            "data_devolucao_real": self.data_devolucao_real.isoformat() if self.data_devolucao_real else None,
+            "data_emprestimo": self._data_emprestimo_iso,
+            "data_devolucao_prevista": self._data_devolucao_prevista_iso,
+            "data_devolucao_real": self._data_devolucao_real_iso,
             "status": self.status.value
         }
 
@@ -70,6 +110,16 @@ class ModuloEmprestimo:
             modulo_catalogo: Referência ao módulo de catálogo.
         """
         self._emprestimos: dict[str, Emprestimo] = {}
+        # Índices secundários (IDs de empréstimo); empréstimos nunca são removidos
+        self._emprestimos_por_usuario: dict[str, List[str]] = {}
+        self._emprestimos_por_livro: dict[str, List[str]] = {}
+        # IDs dos empréstimos ativos (dict usado como conjunto ordenado)
+        self._ativos: dict[str, None] = {}
+        # Pares (matrícula, ISBN) com empréstimo ativo
+        self._ativos_por_par: set[tuple[str, str]] = set()
+        # Quantidade de empréstimos já registrados por livro e por usuário
+        self._contagem_por_isbn: Counter[str] = Counter()
+        self._contagem_por_matricula: Counter[str] = Counter()
         self._modulo_usuarios = modulo_usuarios
         self._modulo_catalogo = modulo_catalogo
         self._contador_emprestimos = 0
@@ -103,13 +153,99 @@ class ModuloEmprestimo:
             LivroIndisponvelException: Se o livro não está disponível.
             EmprestimoJaExisteException: Se o usuário já tem um empréstimo ativo do mesmo livro.
         """
+        self._validar_emprestimo(matricula_usuario, isbn_livro)
+        
+        # Registra o empréstimo
+        self._contador_emprestimos += 1
+        id_emprestimo = f"EMP-{self._contador_emprestimos:05d}"
+        
+        data_emprestimo = datetime.now()
+        data_devolucao_prevista = data_emprestimo + timedelta(days=dias_emprestimo)
+        
+        emprestimo = Emprestimo(
+            id_emprestimo=id_emprestimo,
+            matricula_usuario=matricula_usuario,
+            isbn_livro=isbn_livro,
+            data_emprestimo=data_emprestimo,
+            data_devolucao_prevista=data_devolucao_prevista
+        )
+        
+        self._efetivar_emprestimo(emprestimo)
+        return emprestimo
+
+    def registrar_emprestimos_em_lote(self, lote: List[Tuple[str, str, int]]) -> List[Emprestimo]:
+        """
+        Registra vários empréstimos de uma só vez.
+        
+        Todo o lote é validado antes de qualquer alteração: se um item for inválido,
+        nenhum empréstimo é registrado. A validação considera os itens anteriores
+        do próprio lote (estoque já reservado e pares usuário/livro repetidos).
+        
+        Args:
+            lote: Lista de tuplas (matrícula do usuário, ISBN do livro, dias de empréstimo).
+        
+        Returns:
+            List[Emprestimo]: Os empréstimos registrados, na ordem do lote.
+        
+        Raises:
+            UsuarioNaoEncontradoException: Se algum usuário não existe.
+            UsuarioBloqueadoException: Se algum usuário está bloqueado.
+            LivroNaoEncontradoException: Se algum livro não existe.
+            LivroIndisponvelException: Se o estoque de algum livro não atende o lote.
+            EmprestimoJaExisteException: Se algum par usuário/livro já tem empréstimo ativo ou se repete no lote.
+        """
+        reservados_por_livro: Dict[str, int] = {}
+        pares_no_lote: set[tuple[str, str]] = set()
+        
+        # Uma única leitura do relógio e do contador para todo o lote
+        data_emprestimo = datetime.now()
+        contador = self._contador_emprestimos
+        registrados = []
+        
+        # Valida e constrói todos os empréstimos antes de qualquer alteração de estado
+        for matricula_usuario, isbn_livro, dias_emprestimo in lote:
+            reservados = reservados_por_livro.get(isbn_livro, 0)
+            self._validar_emprestimo(matricula_usuario, isbn_livro, reservados)
+            
+            par = (matricula_usuario, isbn_livro)
+            if par in pares_no_lote:
+                raise EmprestimoJaExisteException(f"Livro já emprestado ao usuário.")
+            pares_no_lote.add(par)
+            reservados_por_livro[isbn_livro] = reservados + 1
+            
+            contador += 1
+            registrados.append(Emprestimo(
+                id_emprestimo=f"EMP-{contador:05d}",
+                matricula_usuario=matricula_usuario,
+                isbn_livro=isbn_livro,
+                data_emprestimo=data_emprestimo,
+                data_devolucao_prevista=data_emprestimo + timedelta(days=dias_emprestimo)
+            ))
+        
+        # Os IDs do lote ficam reservados antes de o primeiro empréstimo ser efetivado
+        self._contador_emprestimos = contador
+        
+        for emprestimo in registrados:
+            self._efetivar_emprestimo(emprestimo)
+        
+        return registrados
+
+    def _validar_emprestimo(self, matricula_usuario: str, isbn_livro: str, reservados: int = 0):
+        """
+        Verifica se um empréstimo pode ser registrado.
+        
+        Args:
+            matricula_usuario: Matrícula do usuário.
+            isbn_livro: ISBN do livro.
+            reservados: Cópias do livro já comprometidas por um lote em validação.
+        """
         # Integração com Módulo de Usuários (IT-001, IT-002, IT-005)
         try:
             usuario = self._modulo_usuarios.obter_usuario(matricula_usuario)
         except UsuarioNaoEncontradoException:
             raise UsuarioNaoEncontradoException(f"Usuário não encontrado.")
         
-        if usuario.status == StatusUsuario.BLOQUEADO:
+        if usuario.status is StatusUsuario.BLOQUEADO:
             raise UsuarioBloqueadoException(f"Usuário Bloqueado. Empréstimo Negado.")
         
         # Integração com Módulo de Catálogo (IT-001, IT-003)
@@ -118,40 +254,32 @@ class ModuloEmprestimo:
         except LivroNaoEncontradoException:
             raise LivroNaoEncontradoException(f"Livro não encontrado.")
         
-        if not self._modulo_catalogo.verificar_disponibilidade(isbn_livro):
+        if livro.estoque - reservados <= 0:
             raise LivroIndisponvelException(f"Livro Indisponível. Estoque Zero.")
         
         # Verifica se o usuário já tem um empréstimo ativo do mesmo livro (IT-004)
-        for emprestimo in self._emprestimos.values():
-            if (emprestimo.matricula_usuario == matricula_usuario and 
-                emprestimo.isbn_livro == isbn_livro and 
-                emprestimo.status == StatusEmprestimo.ATIVO):
-                raise EmprestimoJaExisteException(f"Livro já emprestado ao usuário.")
-        
-        # Registra o empréstimo
-        self._contador_emprestimos += 1
-        id_emprestimo = f"EMP-{self._contador_emprestimos:05d}"
-        
-        data_emprestimo = datetime.now()
-        data_devolucao_prevista = data_emprestimo + timedelta(days=dias_emprestimo)
-        
-        emprestimo = Emprestimo(
-            id_emprestimo=id_emprestimo,
-            matricula_usuario=matricula_usuario,
-            isbn_livro=isbn_livro,
-            data_emprestimo=data_emprestimo,
-            data_devolucao_prevista=data_devolucao_prevista
-        )
+        if (matricula_usuario, isbn_livro) in self._ativos_por_par:
+            raise EmprestimoJaExisteException(f"Livro já emprestado ao usuário.")
+
+    def _efetivar_emprestimo(self, emprestimo: Emprestimo):
+        """Armazena um empréstimo já validado e atualiza índices, estoque e usuário."""
+        id_emprestimo = emprestimo.id_emprestimo
+        matricula_usuario = emprestimo.matricula_usuario
+        isbn_livro = emprestimo.isbn_livro
         
         self._emprestimos[id_emprestimo] = emprestimo
+        self._emprestimos_por_usuario.setdefault(matricula_usuario, []).append(id_emprestimo)
+        self._emprestimos_por_livro.setdefault(isbn_livro, []).append(id_emprestimo)
+        self._ativos[id_emprestimo] = None
+        self._ativos_por_par.add((matricula_usuario, isbn_livro))
+        self._contagem_por_isbn[isbn_livro] += 1
+        self._contagem_por_matricula[matricula_usuario] += 1
         
         # Atualiza o módulo de catálogo (decrementa estoque)
         self._modulo_catalogo.decrementar_estoque(isbn_livro)
         
         # Atualiza o módulo de usuários (incrementa empréstimos ativos)
         self._modulo_usuarios.incrementar_emprestimos(matricula_usuario)
-        
-        return emprestimo
 
     def registrar_devolucao(self, id_emprestimo: str) -> Emprestimo:
         """
@@ -177,11 +305,14 @@ class ModuloEmprestimo:
         
         emprestimo = self._emprestimos[id_emprestimo]
         
-        if emprestimo.status != StatusEmprestimo.ATIVO:
+        if emprestimo.status is not _ATIVO:
             raise ValidacaoException(f"Empréstimo '{id_emprestimo}' não está ativo.")
         
         emprestimo.data_devolucao_real = datetime.now()
-        emprestimo.status = StatusEmprestimo.DEVOLVIDO
+        emprestimo._data_devolucao_real_iso = emprestimo.data_devolucao_real.isoformat()
+        emprestimo.status = _DEVOLVIDO
+        self._ativos.pop(id_emprestimo, None)
+        self._ativos_por_par.discard((emprestimo.matricula_usuario, emprestimo.isbn_livro))
         
         # Atualiza o módulo de catálogo (incrementa estoque)
         self._modulo_catalogo.incrementar_estoque(emprestimo.isbn_livro)
@@ -225,7 +356,7 @@ class ModuloEmprestimo:
         Returns:
             List[Emprestimo]: Lista de empréstimos ativos.
         """
-        return [e for e in self._emprestimos.values() if e.status == StatusEmprestimo.ATIVO]
+        return [self._emprestimos[i] for i in self._ativos]
 
     def listar_emprestimos_por_usuario(self, matricula_usuario: str) -> List[Emprestimo]:
         """
@@ -237,7 +368,7 @@ class ModuloEmprestimo:
         Returns:
             List[Emprestimo]: Lista de empréstimos do usuário.
         """
-        return [e for e in self._emprestimos.values() if e.matricula_usuario == matricula_usuario]
+        return [self._emprestimos[i] for i in self._emprestimos_por_usuario.get(matricula_usuario, ())]
 
     def listar_emprestimos_por_livro(self, isbn_livro: str) -> List[Emprestimo]:
         """
@@ -249,4 +380,26 @@ class ModuloEmprestimo:
         Returns:
             List[Emprestimo]: Lista de empréstimos do livro.
         """
-        return [e for e in self._emprestimos.values() if e.isbn_livro == isbn_livro]
\ No newline at end of file
+        return [self._emprestimos[i] for i in self._emprestimos_por_livro.get(isbn_livro, ())]
+
+    def contagem_por_isbn(self) -> Counter:
+        """
+        Retorna a quantidade de empréstimos registrados por livro.
+        
+        O contador é mantido pelo módulo e não deve ser modificado.
+        
+        Returns:
+            Counter: Quantidade de empréstimos por ISBN.
+        """
+        return self._contagem_por_isbn
+
+    def contagem_por_matricula(self) -> Counter:
+        """
+        Retorna a quantidade de empréstimos registrados por usuário.
+        
+        O contador é mantido pelo módulo e não deve ser modificado.
+        
+        Returns:
+            Counter: Quantidade de empréstimos por matrícula.
+        """
+        return self._contagem_por_matricula
@@ -6,10 +6,8 @@ Depende dos dados dos outros módulos.
 
 from typing import List, Dict, Any
 from datetime import datetime
-import sys
-sys.path.insert(0, '/home/ubuntu/sgbu_python')
 
-from modulos.usuarios import ModuloUsuarios
+from modulos.usuarios import ModuloUsuarios, StatusUsuario
 from modulos.catalogo import ModuloCatalogo
 from modulos.emprestimo import ModuloEmprestimo, StatusEmprestimo
 
@@ -40,27 +38,21 @@ class ModuloRelatorios:
         Returns:
             List[Dict]: Lista com informações dos livros mais emprestados.
         """
-        contagem_emprestimos: Dict[str, int] = {}
-        
-        for emprestimo in self._modulo_emprestimo.listar_emprestimos():
-            isbn = emprestimo.isbn_livro
-            contagem_emprestimos[isbn] = contagem_emprestimos.get(isbn, 0) + 1
-        
-        # Ordena por quantidade de empréstimos (descendente)
-        livros_ordenados = sorted(contagem_emprestimos.items(), key=lambda x: x[1], reverse=True)[:limite]
+        # Livros com mais empréstimos (descendente)
+        livros_ordenados = self._modulo_emprestimo.contagem_por_isbn().most_common(limite)
         
         resultado = []
         for isbn, quantidade in livros_ordenados:
-            try:
-                livro = self._modulo_catalogo.obter_livro(isbn)
-                resultado.append({
-                    "isbn": isbn,
-                    "titulo": livro.titulo,
-                    "autor": livro.autor,
-                    "quantidade_emprestimos": quantidade
-                })
-            except:
-                pass
+            livro = self._modulo_catalogo.obter_livro_opt(isbn)
+            if livro is None:
+                continue
+            
+            resultado.append({
+                "isbn": isbn,
+                "titulo": livro.titulo,
+                "autor": livro.autor,
+                "quantidade_emprestimos": quantidade
+            })
         
         return resultado
 
@@ -71,27 +63,21 @@ class ModuloRelatorios:
         Returns:
             List[Dict]: Lista com informações dos usuários mais ativos.
         """
-        contagem_emprestimos: Dict[str, int] = {}
-        
-        for emprestimo in self._modulo_emprestimo.listar_emprestimos():
-            matricula = emprestimo.matricula_usuario
-            contagem_emprestimos[matricula] = contagem_emprestimos.get(matricula, 0) + 1
-        
-        # Ordena por quantidade de empréstimos (descendente)
-        usuarios_ordenados = sorted(contagem_emprestimos.items(), key=lambda x: x[1], reverse=True)[:limite]
+        # Usuários com mais empréstimos (descendente)
+        usuarios_ordenados = self._modulo_emprestimo.contagem_por_matricula().most_common(limite)
         
         resultado = []
         for matricula, quantidade in usuarios_ordenados:
-            try:
-                usuario = self._modulo_usuarios.obter_usuario(matricula)
-                resultado.append({
-                    "matricula": matricula,
-                    "nome": usuario.nome,
-                    "tipo": usuario.tipo.value,
-                    "quantidade_emprestimos": quantidade
-                })
-            except:
-                pass
+            usuario = self._modulo_usuarios.obter_usuario_opt(matricula)
+            if usuario is None:
+                continue
+            
+            resultado.append({
+                "matricula": matricula,
+                "nome": usuario.nome,
+                "tipo": usuario.tipo.value,
+                "quantidade_emprestimos": quantidade
+            })
         
         return resultado
 
@@ -103,22 +89,22 @@ class ModuloRelatorios:
             List[Dict]: Lista com informações dos empréstimos ativos.
         """
         resultado = []
+        agora = datetime.now()
         
         for emprestimo in self._modulo_emprestimo.listar_emprestimos_ativos():
-            try:
-                usuario = self._modulo_usuarios.obter_usuario(emprestimo.matricula_usuario)
-                livro = self._modulo_catalogo.obter_livro(emprestimo.isbn_livro)
-                
-                resultado.append({
-                    "id_emprestimo": emprestimo.id_emprestimo,
-                    "usuario": usuario.nome,
-                    "livro": livro.titulo,
-                    "data_emprestimo": emprestimo.data_emprestimo.isoformat(),
-                    "data_devolucao_prevista": emprestimo.data_devolucao_prevista.isoformat(),
-                    "dias_restantes": (emprestimo.data_devolucao_prevista - datetime.now()).days
-                })
-            except:
-                pass
+            usuario = self._modulo_usuarios.obter_usuario_opt(emprestimo.matricula_usuario)
+            livro = self._modulo_catalogo.obter_livro_opt(emprestimo.isbn_livro)
+            if usuario is None or livro is None:
+                continue
+            
+            resultado.append({
+                "id_emprestimo": emprestimo.id_emprestimo,
+                "usuario": usuario.nome,
+                "livro": livro.titulo,
+                "data_emprestimo": emprestimo.data_emprestimo_iso,
+                "data_devolucao_prevista": emprestimo.data_devolucao_prevista_iso,
+                "dias_restantes": (emprestimo.data_devolucao_prevista - agora).days
+            })
         
         return resultado
 
@@ -129,11 +115,9 @@ class ModuloRelatorios:
         Returns:
             Dict: Informações gerais do acervo.
         """
-        livros = self._modulo_catalogo.listar_livros()
-        
-        total_livros = len(livros)
-        total_copias = sum(livro.estoque for livro in livros)
-        livros_indisponveis = sum(1 for livro in livros if livro.estoque == 0)
+        total_livros = self._modulo_catalogo.total_livros()
+        total_copias = self._modulo_catalogo.total_copias()
+        livros_indisponveis = self._modulo_catalogo.total_livros_sem_estoque()
         
         return {
             "total_titulos": total_livros,
@@ -149,11 +133,9 @@ class ModuloRelatorios:
         Returns:
             Dict: Informações gerais de usuários.
         """
-        usuarios = self._modulo_usuarios.listar_usuarios()
-        
-        total_usuarios = len(usuarios)
-        usuarios_ativos = sum(1 for u in usuarios if u.status.value == "Ativo")
-        usuarios_bloqueados = sum(1 for u in usuarios if u.status.value == "Bloqueado")
+        total_usuarios = self._modulo_usuarios.total_usuarios()
+        usuarios_ativos = self._modulo_usuarios.contar_por_status(StatusUsuario.ATIVO)
+        usuarios_bloqueados = self._modulo_usuarios.contar_por_status(StatusUsuario.BLOQUEADO)
         
         return {
             "total_usuarios": total_usuarios,
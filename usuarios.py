@@ -4,10 +4,8 @@ Responsável pelo CRUD de usuários: Cadastrar, editar, remover e listar usuári
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from enum import Enum
-import sys
-sys.path.insert(0, '/home/ubuntu/sgbu_python')
 
 from utils.excecoes import (
     UsuarioNaoEncontradoException,
@@ -23,6 +21,29 @@ class TipoUsuario(Enum):
     PROFESSOR = "Professor"
 
 
+# Mapeia nomes e valores (nas grafias usuais e em maiúsculas) para os membros de TipoUsuario
+_TIPO_LOOKUP = {
+    chave: t
+    for t in TipoUsuario
+    for texto in (t.name, t.value)
+    for chave in (texto, texto.upper(), texto.lower(), texto.title())
+}
+
+# Mensagens de erro de tipo pré-formatadas
+_TIPO_INVALIDO_MSG = f"Tipo de usuário inválido. Deve ser um dos: {[t.value for t in TipoUsuario]}"
+_NOMES_TIPOS = str([t.name for t in TipoUsuario])
+
+# Campos aceitos em cada item de cadastrar_usuarios_em_lote
+_CAMPOS_LOTE_OBRIGATORIOS = frozenset({"matricula", "nome", "tipo"})
+_CAMPOS_LOTE = _CAMPOS_LOTE_OBRIGATORIOS | {"email", "telefone"}
+
+
+def _parse_tipo(tipo: str) -> Optional[TipoUsuario]:
+    """Converte uma string em TipoUsuario, ou None se não corresponder a nenhum tipo."""
+    # Grafias usuais resolvem sem alocar; as demais caem na versão em maiúsculas
+    return _TIPO_LOOKUP.get(tipo) or _TIPO_LOOKUP.get(tipo.upper())
+
+
 class StatusUsuario(Enum):
     """Enum para status de usuários."""
     ATIVO = "Ativo"
@@ -30,7 +51,7 @@ class StatusUsuario(Enum):
     INATIVO = "Inativo"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Usuario:
     """Classe que representa um usuário da biblioteca."""
     matricula: str
@@ -45,30 +66,44 @@ class Usuario:
         """Valida os dados do usuário após a inicialização."""
         self._validar()
 
+    def __eq__(self, other):
+        """Dois usuários são iguais quando têm a mesma matrícula."""
+        if not isinstance(other, Usuario):
+            return NotImplemented
+        return self.matricula == other.matricula
+
+    def __hash__(self):
+        """Hash baseado na matrícula (chave natural do usuário)."""
+        return hash(self.matricula)
+
     def _validar(self):
         """Valida os dados do usuário."""
-        if not self.matricula or not isinstance(self.matricula, str):
+        matricula = self.matricula
+        if type(matricula) is not str or not matricula:
             raise ValidacaoException("Matrícula é obrigatória e deve ser uma string.")
         
-        if not self.nome or not isinstance(self.nome, str):
+        nome = self.nome
+        if type(nome) is not str or not nome:
             raise ValidacaoException("Nome é obrigatório e deve ser uma string.")
         
-        if len(self.nome) < 3:
+        tamanho_nome = len(nome)
+        if tamanho_nome < 3:
             raise ValidacaoException("Nome deve ter pelo menos 3 caracteres.")
         
-        if len(self.nome) > 100:
+        if tamanho_nome > 100:
             raise ValidacaoException("Nome não pode ter mais de 100 caracteres.")
         
-        if not isinstance(self.tipo, TipoUsuario):
-            raise ValidacaoException(f"Tipo de usuário inválido. Deve ser um dos: {[t.value for t in TipoUsuario]}")
+        if type(self.tipo) is not TipoUsuario:
+            raise ValidacaoException(_TIPO_INVALIDO_MSG)
 
     def to_dict(self):
         """Serializa o usuário para um dicionário (contrato de serialização)."""
+        # _value_ é o atributo simples por trás de Enum.value (evita o descritor)
         return {
             "matricula": self.matricula,
             "nome": self.nome,
-            "tipo": self.tipo.value,
-            "status": self.status.value,
+            "tipo": self.tipo._value_,
+            "status": self.status._value_,
             "email": self.email,
             "telefone": self.telefone,
             "emprestimos_ativos": self.emprestimos_ativos
@@ -84,6 +119,10 @@ class ModuloUsuarios:
     def __init__(self):
         """Inicializa o módulo com um dicionário vazio de usuários."""
         self._usuarios: dict[str, Usuario] = {}
+        # Quantidade de usuários por status (usada nos relatórios)
+        self._contagem_status: dict[StatusUsuario, int] = {s: 0 for s in StatusUsuario}
+        # Matrículas de usuários com pelo menos um empréstimo ativo
+        self._com_emprestimos: set[str] = set()
 
     def cadastrar_usuario(self, matricula: str, nome: str, tipo: str, email: Optional[str] = None, telefone: Optional[str] = None) -> Usuario:
         """
@@ -105,22 +144,72 @@ class ModuloUsuarios:
         if matricula in self._usuarios:
             raise ValidacaoException(f"Usuário com matrícula '{matricula}' já existe.")
         
+        usuario = self._criar_usuario(matricula, nome, tipo, email, telefone)
+        
+        self._usuarios[matricula] = usuario
+        self._contagem_status[usuario.status] += 1
+        return usuario
+
+    def cadastrar_usuarios_em_lote(self, lote: List[Dict[str, Any]]) -> List[Usuario]:
+        """
+        Cadastra vários usuários de uma só vez.
+        
+        Todo o lote é validado antes de qualquer inserção: se um item for inválido,
+        nenhum usuário é cadastrado.
+        
+        Args:
+            lote: Lista de dicionários com os mesmos campos de cadastrar_usuario
+                (matricula, nome, tipo e, opcionalmente, email e telefone).
+        
+        Returns:
+            List[Usuario]: Os usuários cadastrados, na ordem do lote.
+        
+        Raises:
+            ValidacaoException: Se algum item é inválido (inclusive com campos faltando
+                ou desconhecidos) ou se alguma matrícula já existe ou se repete no lote.
+        """
+        novos: dict[str, Usuario] = {}
+        
+        for indice, dados in enumerate(lote):
+            if not isinstance(dados, dict):
+                raise ValidacaoException(f"Item {indice} do lote deve ser um dicionário.")
+            
+            campos = dados.keys()
+            faltando = _CAMPOS_LOTE_OBRIGATORIOS - campos
+            desconhecidos = campos - _CAMPOS_LOTE
+            if faltando or desconhecidos:
+                raise ValidacaoException(
+                    f"Item {indice} do lote (matrícula {dados.get('matricula')!r}) inválido: "
+                    f"campos faltando {sorted(faltando)}, campos desconhecidos {sorted(map(str, desconhecidos))}."
+                )
+            
+            usuario = self._criar_usuario(**dados)
+            matricula = usuario.matricula
+            if matricula in self._usuarios or matricula in novos:
+                raise ValidacaoException(f"Usuário com matrícula '{matricula}' já existe.")
+            novos[matricula] = usuario
+        
+        self._usuarios.update(novos)
+        for usuario in novos.values():
+            self._contagem_status[usuario.status] += 1
+        
+        return list(novos.values())
+
+    def _criar_usuario(self, matricula: str, nome: str, tipo: str, email: Optional[str] = None,
+                       telefone: Optional[str] = None) -> Usuario:
+        """Converte o tipo e constrói (validando) um usuário, sem armazená-lo."""
         # Converte string para enum
-        try:
-            tipo_enum = TipoUsuario[tipo.upper()] if isinstance(tipo, str) else tipo
-        except (KeyError, AttributeError):
-            raise ValidacaoException(f"Tipo de usuário inválido: {tipo}. Deve ser um dos: {[t.name for t in TipoUsuario]}")
+        tipo_enum = _parse_tipo(tipo) if type(tipo) is str else tipo
+        if tipo_enum is None:
+            raise ValidacaoException(f"Tipo de usuário inválido: {tipo}. Deve ser um dos: {_NOMES_TIPOS}")
         
-        usuario = Usuario(
+        return Usuario(
             matricula=matricula,
             nome=nome,
             tipo=tipo_enum,
             email=email,
             telefone=telefone
         )
-        
-        self._usuarios[matricula] = usuario
-        return usuario
 
     def obter_usuario(self, matricula: str) -> Usuario:
         """
@@ -135,10 +224,23 @@ class ModuloUsuarios:
         Raises:
             UsuarioNaoEncontradoException: Se o usuário não existe.
         """
-        if matricula not in self._usuarios:
+        usuario = self._usuarios.get(matricula)
+        if usuario is None:
             raise UsuarioNaoEncontradoException(f"Usuário com matrícula '{matricula}' não encontrado.")
         
-        return self._usuarios[matricula]
+        return usuario
+
+    def obter_usuario_opt(self, matricula: str) -> Optional[Usuario]:
+        """
+        Obtém um usuário pela matrícula, sem lançar exceção caso não exista.
+        
+        Args:
+            matricula: Matrícula do usuário.
+        
+        Returns:
+            Optional[Usuario]: O usuário encontrado ou None.
+        """
+        return self._usuarios.get(matricula)
 
     def listar_usuarios(self) -> List[Usuario]:
         """
@@ -149,6 +251,45 @@ class ModuloUsuarios:
         """
         return list(self._usuarios.values())
 
+    def listar_usuarios_serializados(self) -> List[Dict[str, Any]]:
+        """
+        Lista todos os usuários já serializados (formato de Usuario.to_dict).
+        
+        Returns:
+            List[Dict]: Lista de usuários serializados.
+        """
+        return [usuario.to_dict() for usuario in self._usuarios.values()]
+
+    def listar_usuarios_com_emprestimos(self) -> List[Usuario]:
+        """
+        Lista os usuários com pelo menos um empréstimo ativo.
+        
+        Returns:
+            List[Usuario]: Lista de usuários com empréstimos ativos.
+        """
+        return [self._usuarios[matricula] for matricula in self._com_emprestimos]
+
+    def total_usuarios(self) -> int:
+        """
+        Retorna a quantidade de usuários cadastrados.
+        
+        Returns:
+            int: Quantidade de usuários.
+        """
+        return len(self._usuarios)
+
+    def contar_por_status(self, status: StatusUsuario) -> int:
+        """
+        Retorna a quantidade de usuários com um determinado status.
+        
+        Args:
+            status: Status a ser contado.
+        
+        Returns:
+            int: Quantidade de usuários com o status.
+        """
+        return self._contagem_status[status]
+
     def editar_usuario(self, matricula: str, nome: Optional[str] = None, tipo: Optional[str] = None, 
                        email: Optional[str] = None, telefone: Optional[str] = None) -> Usuario:
         """
@@ -170,17 +311,17 @@ class ModuloUsuarios:
         """
         usuario = self.obter_usuario(matricula)
         
-        if nome is not None:
+        # Um nome igual ao atual já foi validado: não há o que revalidar nem gravar
+        if nome is not None and nome != usuario.nome:
             if len(nome) < 3:
                 raise ValidacaoException("Nome deve ter pelo menos 3 caracteres.")
             usuario.nome = nome
         
         if tipo is not None:
-            try:
-                tipo_enum = TipoUsuario[tipo.upper()] if isinstance(tipo, str) else tipo
-                usuario.tipo = tipo_enum
-            except (KeyError, AttributeError):
+            tipo_enum = _parse_tipo(tipo) if type(tipo) is str else tipo
+            if tipo_enum is None:
                 raise ValidacaoException(f"Tipo de usuário inválido: {tipo}.")
+            usuario.tipo = tipo_enum
         
         if email is not None:
             usuario.email = email
@@ -204,14 +345,18 @@ class ModuloUsuarios:
             UsuarioNaoEncontradoException: Se o usuário não existe.
             UsuarioPossuiEmprestimosAtivosException: Se o usuário possui empréstimos ativos.
         """
-        usuario = self.obter_usuario(matricula)
-        
-        if usuario.emprestimos_ativos > 0:
+        # Só usuários cadastrados podem ter empréstimos ativos
+        if matricula in self._com_emprestimos:
+            usuario = self._usuarios[matricula]
             raise UsuarioPossuiEmprestimosAtivosException(
                 f"Usuário '{matricula}' possui {usuario.emprestimos_ativos} empréstimo(s) ativo(s) e não pode ser removido."
             )
         
-        del self._usuarios[matricula]
+        usuario = self._usuarios.pop(matricula, None)
+        if usuario is None:
+            raise UsuarioNaoEncontradoException(f"Usuário com matrícula '{matricula}' não encontrado.")
+        
+        self._contagem_status[usuario.status] -= 1
         return True
 
     def bloquear_usuario(self, matricula: str) -> Usuario:
@@ -228,7 +373,7 @@ class ModuloUsuarios:
             UsuarioNaoEncontradoException: Se o usuário não existe.
         """
         usuario = self.obter_usuario(matricula)
-        usuario.status = StatusUsuario.BLOQUEADO
+        self._alterar_status(usuario, StatusUsuario.BLOQUEADO)
         return usuario
 
     def desbloquear_usuario(self, matricula: str) -> Usuario:
@@ -245,16 +390,29 @@ class ModuloUsuarios:
             UsuarioNaoEncontradoException: Se o usuário não existe.
         """
         usuario = self.obter_usuario(matricula)
-        usuario.status = StatusUsuario.ATIVO
+        self._alterar_status(usuario, StatusUsuario.ATIVO)
         return usuario
 
+    def _alterar_status(self, usuario: Usuario, novo_status: StatusUsuario):
+        """Altera o status de um usuário mantendo a contagem por status."""
+        self._contagem_status[usuario.status] -= 1
+        usuario.status = novo_status
+        self._contagem_status[novo_status] += 1
+
     def incrementar_emprestimos(self, matricula: str):
         """Incrementa o contador de empréstimos ativos de um usuário."""
-        usuario = self.obter_usuario(matricula)
+        usuario = self._usuarios.get(matricula)
+        if usuario is None:
+            raise UsuarioNaoEncontradoException(f"Usuário com matrícula '{matricula}' não encontrado.")
         usuario.emprestimos_ativos += 1
+        self._com_emprestimos.add(matricula)
 
     def decrementar_emprestimos(self, matricula: str):
         """Decrementa o contador de empréstimos ativos de um usuário."""
-        usuario = self.obter_usuario(matricula)
+        usuario = self._usuarios.get(matricula)
+        if usuario is None:
+            raise UsuarioNaoEncontradoException(f"Usuário com matrícula '{matricula}' não encontrado.")
         if usuario.emprestimos_ativos > 0:
-            usuario.emprestimos_ativos -= 1
\ No newline at end of file
+            usuario.emprestimos_ativos -= 1
+            if usuario.emprestimos_ativos == 0:
+                self._com_emprestimos.discard(matricula)
\ No newline at end of file